@@ -1,16 +1,14 @@
 import argparse
 import json
 import os
+import sys
 from pathlib import Path
 import yaml
 from ast import literal_eval
-import copy
 
 import bilby
 import bilby.core
-import matplotlib
 import numpy as np
-from scipy.interpolate import interp1d
 import pandas as pd
 from astropy import time
 from bilby.core.likelihood import ZeroLikelihood
@@ -20,11 +18,9 @@ from .injection import create_light_curve_data
 from .likelihood import OpticalLightCurve
 from .model import create_light_curve_model_from_args, model_parameters_dict
 from .prior import create_prior_from_args
-from .utils import getFilteredMag, dataProcess
+from .utils import getFilteredMag
 from .io import loadEvent
 
-matplotlib.use("agg")
-
 
 def get_parser(**kwargs):
     add_help = kwargs.get("add_help", True)
@@ -175,7 +171,7 @@ def get_parser(**kwargs):
         "--cpus",
         type=int,
         default=1,
-        help="Number of cores to be used, only needed for dynesty (default: 1)",
+        help="Number of cores to be used, bilby sets up a multiprocessing pool of this size for samplers supporting it, e.g. dynesty (default: 1)",
     )
     parser.add_argument(
         "--nlive", type=int, default=2048, help="Number of live points (default: 2048)"
@@ -396,7 +392,39 @@ def get_parser(**kwargs):
     return parser
 
 
-def analysis(args):
+def is_rank0():
+    """Check if this is the main process, which is always the case without MPI"""
+    try:
+        from mpi4py import MPI
+    except ImportError:
+        return True
+
+    return MPI.COMM_WORLD.Get_rank() == 0
+
+
+def light_curve_figure():
+    """Create the light-curve figure on an Agg canvas, detached from pyplot"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(20, 16), constrained_layout=True)
+    FigureCanvasAgg(fig)
+
+    return fig
+
+
+def analysis(args, fig=None):
+
+    # bilby has no native nautilus support, and nautilus-sampler itself does
+    # not register a bilby sampler plugin, so fail before any of the setup
+    if (
+        args.sampler == "nautilus"
+        and "nautilus" not in bilby.core.sampler.IMPLEMENTED_SAMPLERS
+    ):
+        print(
+            "nautilus is not available as a bilby sampler, install a bilby sampler plugin providing it to use --sampler nautilus"
+        )
+        exit()
 
     if args.sampler == "pymultinest":
         if len(args.outdir) > 64:
@@ -438,6 +466,10 @@ def analysis(args):
             raise ValueError("Need at least one valid filter.")
     else:
         filters = None
+    if args.photometry_augmentation_filters:
+        augmentation_filters = args.photometry_augmentation_filters.split(",")
+    else:
+        augmentation_filters = []
 
     # create the kilonova data if an injection set is given
     if args.injection:
@@ -511,57 +543,37 @@ def analysis(args):
                     }
             else:
                 detection_limit = {}
-            data_out = np.empty((0, 6))
+            columns = ["jd", "mag", "mag_unc", "filter", "limmag", "programid"]
+            lc_per_filt = []
+            if filters:
+                filts = list(dict.fromkeys(filters + augmentation_filters))
             for filt in data.keys():
-                if filters:
-                    if args.photometry_augmentation_filters:
-                        filts = list(
-                            set(
-                                filters
-                                + args.photometry_augmentation_filters.split(",")
-                            )
-                        )
-                    else:
-                        filts = filters
-                    if filt not in filts:
-                        continue
-                for row in data[filt]:
-                    mjd, mag, mag_unc = row
-                    if not np.isfinite(mag_unc):
-                        data_out = np.append(
-                            data_out,
-                            np.array([[mjd, 99.0, 99.0, filt, mag, 0.0]]),
-                            axis=0,
-                        )
-                    else:
-                        if filt in detection_limit:
-                            data_out = np.append(
-                                data_out,
-                                np.array(
-                                    [
-                                        [
-                                            mjd,
-                                            mag,
-                                            mag_unc,
-                                            filt,
-                                            detection_limit[filt],
-                                            0.0,
-                                        ]
-                                    ]
-                                ),
-                                axis=0,
-                            )
-                        else:
-                            data_out = np.append(
-                                data_out,
-                                np.array([[mjd, mag, mag_unc, filt, np.inf, 0.0]]),
-                                axis=0,
-                            )
+                if filters and filt not in filts:
+                    continue
+                # non-detections are written as limits with 99 mag
+                mjd, mag, mag_unc = data[filt].T
+                detected = np.isfinite(mag_unc)
+                lc_per_filt.append(
+                    pd.DataFrame(
+                        {
+                            "jd": mjd,
+                            "mag": np.where(detected, mag, 99.0),
+                            "mag_unc": np.where(detected, mag_unc, 99.0),
+                            "filter": filt,
+                            "limmag": np.where(
+                                detected, detection_limit.get(filt, np.inf), mag
+                            ),
+                            "programid": 0.0,
+                        },
+                        columns=columns,
+                    )
+                )
 
-            columns = ["jd", "mag", "mag_unc", "filter", "limmag", "programid"]
-            lc = pd.DataFrame(data=data_out, columns=columns)
-            lc.sort_values("jd", inplace=True)
-            lc = lc.reset_index(drop=True)
+            if lc_per_filt:
+                lc = pd.concat(lc_per_filt, ignore_index=True)
+            else:
+                lc = pd.DataFrame(columns=columns)
+            lc = lc.sort_values("jd").reset_index(drop=True)
             lc.to_csv(args.injection_outfile)
 
     else:
@@ -571,9 +583,10 @@ def analysis(args):
 
         except ValueError:
             with open(args.data) as f:
-                data = json.load(f)
-                for key in data.keys():
-                    data[key] = np.array(data[key])
+                data = {
+                    key: np.asarray(value, dtype=float)
+                    for key, value in json.load(f).items()
+                }
 
         if args.trigger_time is None:
             # load the minimum time as trigger time
@@ -590,23 +603,13 @@ def analysis(args):
     if args.remove_nondetections:
         filters_to_check = list(data.keys())
         for filt in filters_to_check:
-            idx = np.where(np.isfinite(data[filt][:, 2]))[0]
-            data[filt] = data[filt][idx, :]
-            if len(idx) == 0:
+            data[filt] = data[filt][np.isfinite(data[filt][:, 2])]
+            if len(data[filt]) == 0:
                 del data[filt]
 
     # check for detections
-    detection = False
-    notallnan = False
-    for filt in data.keys():
-        idx = np.where(np.isfinite(data[filt][:, 2]))[0]
-        if len(idx) > 0:
-            detection = True
-        idx = np.where(np.isfinite(data[filt][:, 1]))[0]
-        if len(idx) > 0:
-            notallnan = True
-        if detection and notallnan:
-            break
+    detection = any(np.any(np.isfinite(data[filt][:, 2])) for filt in data)
+    notallnan = any(np.any(np.isfinite(data[filt][:, 1])) for filt in data)
     if (not detection) or (not notallnan):
         raise ValueError("Need at least one detection to do fitting.")
 
@@ -614,29 +617,19 @@ def analysis(args):
         error_budget = [args.error_budget]
     else:
         error_budget = [float(x) for x in args.error_budget.split(",")]
-    if args.filters:
-        if args.photometry_augmentation_filters:
-            filters = list(
-                set(
-                    args.filters.split(",")
-                    + args.photometry_augmentation_filters.split(",")
-                )
-            )
-        else:
-            filters = args.filters.split(",")
-
-        values_to_indices = {v: i for i, v in enumerate(filters)}
-        filters_to_analyze = sorted(
-            list(set(filters).intersection(set(list(data.keys())))),
-            key=lambda v: values_to_indices[v],
-        )
+    if filters:
+        filters_to_analyze = [
+            filt
+            for filt in dict.fromkeys(filters + augmentation_filters)
+            if filt in data
+        ]
 
         if len(error_budget) == 1:
             error_budget = dict(
                 zip(filters_to_analyze, error_budget * len(filters_to_analyze))
             )
-        elif len(args.filters.split(",")) == len(error_budget):
-            error_budget = dict(zip(args.filters.split(","), error_budget))
+        elif len(filters) == len(error_budget):
+            error_budget = dict(zip(filters, error_budget))
         else:
             raise ValueError("error_budget must be the same length as filters")
 
@@ -659,8 +652,10 @@ def analysis(args):
     priors = create_prior_from_args(model_names, args)
 
     # setup the likelihood
-    if args.detection_limit:
-        args.detection_limit = literal_eval(args.detection_limit)
+    # parse into a local, args is reused by main for every config set
+    detection_limit = args.detection_limit
+    if isinstance(detection_limit, str) and detection_limit:
+        detection_limit = literal_eval(detection_limit)
     likelihood_kwargs = dict(
         light_curve_model=light_curve_model,
         filters=filters_to_analyze,
@@ -670,10 +665,13 @@ def analysis(args):
         tmax=args.tmax,
         error_budget=error_budget,
         verbose=args.verbose,
-        detection_limit=args.detection_limit,
+        detection_limit=detection_limit,
     )
 
     likelihood = OpticalLightCurve(**likelihood_kwargs)
+    # the likelihood already ran dataProcess with the same filters, trigger
+    # time and time window, so keep its result for the chi2 calculation
+    processed_data = likelihood.light_curve_data
     if args.bilby_zero_likelihood_mode:
         likelihood = ZeroLikelihood(likelihood)
 
@@ -692,6 +690,13 @@ def analysis(args):
     else:
         nlive = args.nlive
 
+    # bilby forwards queue_size to a multiprocessing pool for the samplers
+    # supporting it, the MPI based ones have to be launched with mpiexec
+    if args.cpus > 1 and args.sampler in ["pymultinest", "ultranest"]:
+        print(
+            f"{args.sampler} does not use a multiprocessing pool, run it under mpiexec to parallelize the likelihood evaluations"
+        )
+
     if args.skip_sampling:
         print("Sampling for 1 iteration and plotting checkpointed results.")
         if args.sampler == "pymultinest":
@@ -700,33 +705,59 @@ def analysis(args):
             sampler_kwargs["niter"] = 1
         elif args.sampler == "dynesty":
             sampler_kwargs["maxiter"] = 1
+        elif args.sampler == "nautilus":
+            # the likelihood budget is counted across resumed runs
+            sampler_kwargs["n_like_max"] = 1
+
+    # pymultinest duplicates the whole inference on every process if mpi4py
+    # is importable without the job being launched by mpirun/mpiexec/srun,
+    # so hide mpi4py from it while sampling unless an MPI launcher set up
+    # the environment
+    hide_mpi4py = (
+        args.sampler == "pymultinest"
+        and "mpi4py" not in sys.modules
+        and not any(
+            key in os.environ
+            for key in [
+                "OMPI_COMM_WORLD_SIZE",
+                "PMI_SIZE",
+                "PMIX_RANK",
+                "MPI_LOCALNRANKS",
+                "MV2_COMM_WORLD_SIZE",
+            ]
+        )
+    )
+    if hide_mpi4py:
+        sys.modules["mpi4py"] = None
 
-    result = bilby.run_sampler(
-        likelihood,
-        priors,
-        sampler=args.sampler,
-        outdir=args.outdir,
-        label=args.label,
-        nlive=nlive,
-        seed=args.seed,
-        soft_init=args.soft_init,
-        queue_size=args.cpus,
-        check_point_delta_t=3600,
-        **sampler_kwargs,
-    )
-
-    # check if it is running under mpi
     try:
-        from mpi4py import MPI
+        result = bilby.run_sampler(
+            likelihood,
+            priors,
+            sampler=args.sampler,
+            outdir=args.outdir,
+            label=args.label,
+            nlive=nlive,
+            seed=args.seed,
+            soft_init=args.soft_init,
+            queue_size=args.cpus,
+            check_point_delta_t=3600,
+            **sampler_kwargs,
+        )
+    finally:
+        # later imports in the same process, e.g. nmma.pbilby, need mpi4py
+        if hide_mpi4py:
+            del sys.modules["mpi4py"]
 
-        rank = MPI.COMM_WORLD.Get_rank()
-        if rank == 0:
-            pass
-        else:
-            return
+    # when running under mpi, only the main process saves and plots the results
+    if not is_rank0():
+        return fig
 
-    except ImportError:
-        pass
+    # matplotlib is only needed from here on, for the corner and light curve
+    # plots, so it is not imported by the sampling processes
+    import matplotlib
+
+    matplotlib.use("agg")
 
     result.save_posterior_samples()
 
@@ -777,10 +808,10 @@ def analysis(args):
         # Fetch bestfit parameters
         ##########################
         posterior_samples = pd.read_csv(posterior_file, header=0, delimiter=" ")
-        bestfit_idx = np.argmax(posterior_samples.log_likelihood.to_numpy())
-        bestfit_params = posterior_samples.to_dict(orient="list")
-        for key in bestfit_params.keys():
-            bestfit_params[key] = bestfit_params[key][bestfit_idx]
+        bestfit_idx = posterior_samples.index.get_loc(
+            posterior_samples["log_likelihood"].idxmax()
+        )
+        bestfit_params = posterior_samples.iloc[bestfit_idx].to_dict()
         print(
             f"Best fit parameters: {str(bestfit_params)}\nBest fit index: {bestfit_idx}"
         )
@@ -789,11 +820,14 @@ def analysis(args):
         # Generate the lightcurve
         #########################
         _, mag = light_curve_model.generate_lightcurve(sample_times, bestfit_params)
+        # distance modulus, shared by all the filters and model components
+        if bestfit_params["luminosity_distance"] > 0:
+            dm = 5.0 * np.log10(bestfit_params["luminosity_distance"] * 1e6 / 10.0)
+        else:
+            dm = 0.0
         for filt in mag.keys():
-            if bestfit_params["luminosity_distance"] > 0:
-                mag[filt] += 5.0 * np.log10(
-                    bestfit_params["luminosity_distance"] * 1e6 / 10.0
-                )
+            mag[filt] = np.asarray(mag[filt], dtype=np.float64)
+            np.add(mag[filt], dm, out=mag[filt])
         mag["bestfit_sample_times"] = sample_times
 
         if "timeshift" in bestfit_params:
@@ -804,43 +838,46 @@ def analysis(args):
         ######################
         # calculate the chi2 #
         ######################
-        processed_data = dataProcess(
-            data, filters_to_analyze, trigger_time, args.tmin, args.tmax
-        )
         chi2 = 0.0
         dof = 0.0
         chi2_per_dof_dict = {}
+        # the best-fit sample times are monotonic so the lc can be
+        # interpolated linearly with np.interp
+        bestfit_times = mag["bestfit_sample_times"]
         for filt in filters_to_analyze:
-            # make best-fit lc interpolation
-            sample_times = mag["bestfit_sample_times"]
-            mag_used = mag[filt]
-            interp = interp1d(sample_times, mag_used)
-            # fetch data
-            samples = copy.deepcopy(processed_data[filt])
-            t, y, sigma_y = samples[:, 0], samples[:, 1], samples[:, 2]
-            # shift t values by timeshift
-            if "timeshift" in bestfit_params:
-                t += bestfit_params["timeshift"]
+            # fetch data, shifting t values by timeshift without
+            # mutating the processed data
+            t = processed_data[filt][:, 0] + bestfit_params.get("timeshift", 0.0)
+            y = processed_data[filt][:, 1]
+            sigma_y = processed_data[filt][:, 2]
             # only the detection data are needed
-            finite_idx = np.where(np.isfinite(sigma_y))[0]
-            if len(finite_idx) > 0:
+            finite_mask = np.isfinite(sigma_y)
+            # the bestfit lc is NaN outside of its time grid (and wherever
+            # the model itself is NaN), those detections are left out
+            model_mag = np.interp(
+                t[finite_mask], bestfit_times, mag[filt], left=np.nan, right=np.nan
+            )
+            model_mask = np.isfinite(model_mag)
+            if not np.all(model_mask):
+                print(
+                    f"{np.count_nonzero(~model_mask)} detections in {filt} are not covered by the bestfit light curve and are left out of the chi2"
+                )
+                finite_mask[finite_mask] = model_mask
+                model_mag = model_mag[model_mask]
+            n_det = np.count_nonzero(finite_mask)
+            if n_det > 0:
                 # fetch the erorr_budget
                 if "em_syserr" in bestfit_params:
                     err = bestfit_params["em_syserr"]
                 else:
                     err = error_budget[filt]
-                t_det, y_det, sigma_y_det = (
-                    t[finite_idx],
-                    y[finite_idx],
-                    sigma_y[finite_idx],
-                )
-                num = (y_det - interp(t_det)) ** 2
-                den = sigma_y_det**2 + err**2
-                chi2_per_filt = np.sum(num / den)
+                resid = y[finite_mask] - model_mag
+                den = sigma_y[finite_mask] ** 2 + err**2
+                chi2_per_filt = np.dot(resid * resid, 1.0 / den)
                 # store the data
                 chi2 += chi2_per_filt
-                dof += len(finite_idx)
-                chi2_per_dof_dict[filt] = chi2_per_filt / len(finite_idx)
+                dof += n_det
+                chi2_per_dof_dict[filt] = chi2_per_filt / n_det
 
         chi2_per_dof = chi2 / dof
 
@@ -850,9 +887,10 @@ def analysis(args):
         bestfit_to_write["log_bayes_factor_err"] = result.log_evidence_err
         bestfit_to_write["Best fit index"] = int(bestfit_idx)
         bestfit_to_write["Magnitudes"] = {i: mag[i].tolist() for i in mag.keys()}
-        bestfit_to_write["chi2_per_dof"] = chi2_per_dof
+        bestfit_to_write["chi2_per_dof"] = float(chi2_per_dof)
         bestfit_to_write["chi2_per_dof_per_filt"] = {
-            i: chi2_per_dof_dict[i].tolist() for i in chi2_per_dof_dict.keys()
+            filt: float(chi2_per_filt)
+            for filt, chi2_per_filt in chi2_per_dof_dict.items()
         }
         bestfit_file = os.path.join(args.outdir, f"{args.label}_bestfit_params.json")
 
@@ -862,8 +900,8 @@ def analysis(args):
         print(f"Saved bestfit parameters and magnitudes to {bestfit_file}")
 
     if args.plot:
-        import matplotlib.pyplot as plt
-        from matplotlib.pyplot import cm
+        from matplotlib import cm, rc_context
+        from matplotlib.collections import LineCollection
 
         if len(models) > 1:
             _, mag_all = light_curve_model.generate_lightcurve(
@@ -872,133 +910,161 @@ def analysis(args):
 
             for ii in range(len(mag_all)):
                 for filt in mag_all[ii].keys():
-                    if bestfit_params["luminosity_distance"] > 0:
-                        mag_all[ii][filt] += 5.0 * np.log10(
-                            bestfit_params["luminosity_distance"] * 1e6 / 10.0
-                        )
-            model_colors = cm.Spectral(np.linspace(0, 1, len(models)))[::-1]
+                    mag_all[ii][filt] = np.asarray(mag_all[ii][filt], dtype=np.float64)
+                    np.add(mag_all[ii][filt], dm, out=mag_all[ii][filt])
+            model_colors = cm.Spectral(np.linspace(1, 0, len(models)))
 
-        filters_plot = []
+        # collect the plottable filters along with their masked data
+        # (filter, time since trigger, mag, mag error, detection mask)
+        plot_items = []
         for filt in filters_to_analyze:
             if filt not in data:
                 continue
-            samples = data[filt]
-            t, y, sigma_y = samples[:, 0], samples[:, 1], samples[:, 2]
-            idx = np.where(~np.isnan(y))[0]
-            t, y, sigma_y = t[idx], y[idx], sigma_y[idx]
-            if len(t) == 0:
+            mag_data = data[filt][:, 1]
+            # y == y is False exactly for NaN, drop the samples without a mag
+            samples = data[filt][mag_data == mag_data]
+            if len(samples) == 0:
                 continue
-            filters_plot.append(filt)
-
-        colors = cm.Spectral(np.linspace(0, 1, len(filters_plot)))[::-1]
+            plot_items.append(
+                (
+                    filt,
+                    samples[:, 0] - trigger_time,
+                    samples[:, 1],
+                    samples[:, 2],
+                    np.isfinite(samples[:, 2]),
+                )
+            )
+        filters_plot = [item[0] for item in plot_items]
+
+        colors = cm.Spectral(np.linspace(1, 0, len(filters_plot)))
+
+        # filter the combined light curve, followed by each of the model
+        # components, once into a (n_filters, n_models + 1, n_times) array
+        mags_to_plot = [mag] + mag_all if len(models) > 1 else [mag]
+        mag_matrix = np.stack(
+            [
+                [getFilteredMag(mag_per_model, filt) for mag_per_model in mags_to_plot]
+                for filt in filters_plot
+            ]
+        )
+        # the panels are ~2000 pixels wide, so thin out denser model curves
+        stride = max(1, len(bestfit_times) // 2000)
+        plot_times = bestfit_times[::stride]
+        mag_matrix = mag_matrix[..., ::stride]
 
         plotName = os.path.join(args.outdir, f"{args.label}_lightcurves.png")
-        plt.figure(figsize=(20, 16))
+        # reuse the figure of a previous analysis set, if main handed one over,
+        # it is only created here so that the sampling processes never import
+        # matplotlib
+        if fig is None:
+            fig = light_curve_figure()
+        else:
+            fig.clear()
         color2 = "coral"
+        xlim = tuple(float(x) for x in args.xlim.split(","))
+        ylim = tuple(float(x) for x in args.ylim.split(","))
 
-        cnt = 0
-        for filt, color in zip(filters_plot, colors):
-            cnt = cnt + 1
-            if cnt == 1:
-                ax1 = plt.subplot(len(filters_plot), 1, cnt)
-            else:
-                ax2 = plt.subplot(len(filters_plot), 1, cnt, sharex=ax1, sharey=ax1)
-
-            samples = data[filt]
-            t, y, sigma_y = samples[:, 0], samples[:, 1], samples[:, 2]
-            t -= trigger_time
-            idx = np.where(~np.isnan(y))[0]
-            t, y, sigma_y = t[idx], y[idx], sigma_y[idx]
-
-            idx = np.where(np.isfinite(sigma_y))[0]
-            plt.errorbar(
-                t[idx],
-                y[idx],
-                sigma_y[idx],
-                fmt="o",
-                color="k",
-                markersize=16,
-            )  # or color=color
-
-            idx = np.where(~np.isfinite(sigma_y))[0]
-            plt.errorbar(
-                t[idx], y[idx], sigma_y[idx], fmt="v", color="k", markersize=16
-            )  # or color=color
-
-            mag_plot = getFilteredMag(mag, filt)
-
-            plt.plot(
-                mag["bestfit_sample_times"],
-                mag_plot,
-                color=color2,
-                linewidth=3,
-                linestyle="--",
-            )
-
-            if len(models) > 1:
-                plt.fill_between(
-                    mag["bestfit_sample_times"],
-                    mag_plot + error_budget[filt],
-                    mag_plot - error_budget[filt],
-                    facecolor=color2,
-                    alpha=0.2,
-                    label="Combined",
+        # grid the panels and size their tick labels as they get created
+        with rc_context(
+            {"axes.grid": True, "xtick.labelsize": 36, "ytick.labelsize": 36}
+        ):
+            axes = fig.subplots(
+                len(plot_items), 1, sharex=True, sharey=True, squeeze=False
+            )[:, 0]
+            ax1 = axes[0]
+            ax1.set_yticks([26, 22, 18, 14])
+            for ax, (filt, t, y, sigma_y, det), mag_plot_all, color in zip(
+                axes, plot_items, mag_matrix, colors
+            ):
+                # error bars of the detections as a single collection of segments
+                ax.add_collection(
+                    LineCollection(
+                        np.stack(
+                            [
+                                np.column_stack((t[det], y[det] - sigma_y[det])),
+                                np.column_stack((t[det], y[det] + sigma_y[det])),
+                            ],
+                            axis=1,
+                        ),
+                        colors="k",
+                        zorder=2,
+                    )
                 )
-            else:
-                plt.fill_between(
-                    mag["bestfit_sample_times"],
-                    mag_plot + error_budget[filt],
-                    mag_plot - error_budget[filt],
-                    facecolor=color2,
-                    alpha=0.2,
+                # detections and upper limits, drawn above the bands and the
+                # model curves, at the zorder errorbar gives its data markers
+                ax.scatter(
+                    t[det], y[det], s=16**2, marker="o", color="k", zorder=2.1
+                )  # or color=color
+                ax.scatter(t[~det], y[~det], s=16**2, marker="v", color="k", zorder=2.1)
+
+                # the combined and the per-model light curves in one call
+                ax.plot(
+                    plot_times,
+                    mag_plot_all.T,
+                    color=color2,
+                    linewidth=3,
+                    linestyle="--",
                 )
 
-            if len(models) > 1:
-                for ii in range(len(mag_all)):
-                    mag_plot = getFilteredMag(mag_all[ii], filt)
-                    plt.plot(
-                        mag["bestfit_sample_times"],
-                        mag_plot,
-                        color=color2,
-                        linewidth=3,
-                        linestyle="--",
+                # edges of the error-budget bands of all the light curves at once
+                eb = error_budget[filt]
+                lo = mag_plot_all - eb
+                hi = mag_plot_all + eb
+
+                if len(models) > 1:
+                    ax.fill_between(
+                        plot_times,
+                        hi[0],
+                        lo[0],
+                        facecolor=color2,
+                        alpha=0.2,
+                        label="Combined",
                     )
-                    plt.fill_between(
-                        mag["bestfit_sample_times"],
-                        mag_plot + error_budget[filt],
-                        mag_plot - error_budget[filt],
-                        facecolor=model_colors[ii],
+                    for ii in range(len(mag_all)):
+                        ax.fill_between(
+                            plot_times,
+                            hi[ii + 1],
+                            lo[ii + 1],
+                            facecolor=model_colors[ii],
+                            alpha=0.2,
+                            label=models[ii].model,
+                        )
+                else:
+                    ax.fill_between(
+                        plot_times,
+                        hi[0],
+                        lo[0],
+                        facecolor=color2,
                         alpha=0.2,
-                        label=models[ii].model,
                     )
 
-            plt.ylabel("%s" % filt, fontsize=48, rotation=0, labelpad=40)
+                ax.set_ylabel(filt, fontsize=48, rotation=0, labelpad=40)
 
-            plt.xlim([float(x) for x in args.xlim.split(",")])
-            plt.ylim([float(x) for x in args.ylim.split(",")])
-            plt.grid()
+                ax.set_xlim(xlim)
+                ax.set_ylim(ylim)
 
-            if cnt == 1:
-                ax1.set_yticks([26, 22, 18, 14])
-                plt.setp(ax1.get_xticklabels(), visible=False)
-                if len(models) > 1:
-                    plt.legend(
-                        loc="upper right",
-                        prop={"size": 18},
-                        numpoints=1,
-                        shadow=True,
-                        fancybox=True,
-                    )
-            elif not cnt == len(filters_plot):
-                plt.setp(ax2.get_xticklabels(), visible=False)
-            plt.xticks(fontsize=36)
-            plt.yticks(fontsize=36)
+            if len(models) > 1:
+                ax1.legend(
+                    loc="upper right",
+                    prop={"size": 18},
+                    numpoints=1,
+                    shadow=True,
+                    fancybox=True,
+                )
+            for ax in axes:
+                # only the bottom panel keeps its time tick labels
+                ax.label_outer()
+            ax1.set_zorder(1)
+            axes[-1].set_xlabel("Time [days]", fontsize=48)
+            # diagnostic plot: favour a fast PNG encode over the smallest file
+            fig.canvas.print_png(
+                plotName,
+                metadata={"Software": None},
+                pil_kwargs={"compress_level": 3},
+            )
 
-        ax1.set_zorder(1)
-        plt.xlabel("Time [days]", fontsize=48)
-        plt.tight_layout()
-        plt.savefig(plotName)
-        plt.close()
+    # handed back to main, to be reused by the next analysis set
+    return fig
 
 
 def main(args=None):
@@ -1007,6 +1073,9 @@ def main(args=None):
         args = parser.parse_args()
         if args.config is not None:
             yaml_dict = yaml.safe_load(Path(args.config).read_text())
+            # one light-curve figure, created by the first analysis set that
+            # plots and cleared and redrawn by the following ones
+            fig = None
             for analysis_set in yaml_dict.keys():
                 params = yaml_dict[analysis_set]
                 for key, value in params.items():
@@ -1015,7 +1084,7 @@ def main(args=None):
                         print(f"{key} not a known argument... please remove")
                         exit()
                     setattr(args, key, value)
-                analysis(args)
+                fig = analysis(args, fig=fig)
         else:
             analysis(args)
     else:
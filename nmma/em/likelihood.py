@@ -125,9 +125,9 @@ class OpticalLightCurve(Likelihood):
                 )
             else:
                 mag_app_filt = mag_abs_filt
-            usedIdx = np.where(np.isfinite(mag_app_filt))[0]
-            sample_times_used = self.sample_times[usedIdx]
-            mag_app_used = mag_app_filt[usedIdx]
+            usedMask = np.isfinite(mag_app_filt)
+            sample_times_used = self.sample_times[usedMask]
+            mag_app_used = mag_app_filt[usedMask]
             t0 = self.parameters["timeshift"]
             if len(mag_app_used) > 0:
                 mag_app_interp[filt] = interp1d(
@@ -163,16 +163,16 @@ class OpticalLightCurve(Likelihood):
             mag_est = mag_app_interp[filt](data_time)
 
             # seperate the data into bounds (inf err) and actual measurement
-            infIdx = np.where(~np.isfinite(data_sigma))[0]
-            finiteIdx = np.where(np.isfinite(data_sigma))[0]
+            finiteMask = np.isfinite(data_sigma)
+            infMask = ~finiteMask
 
             # evaluate the chisuquare
-            if len(finiteIdx) >= 1:
+            if np.any(finiteMask):
                 minus_chisquare = np.sum(
                     truncated_gaussian(
-                        data_mag[finiteIdx],
-                        data_sigma[finiteIdx],
-                        mag_est[finiteIdx],
+                        data_mag[finiteMask],
+                        data_sigma[finiteMask],
+                        mag_est[finiteMask],
                         self.detection_limit[filt],
                     )
                 )
@@ -185,15 +185,15 @@ class OpticalLightCurve(Likelihood):
             minus_chisquare_total += minus_chisquare
 
             # evaluate the data with infinite error
-            if len(infIdx) > 0:
+            if np.any(infMask):
                 if 'em_syserr' in self.parameters:
                     upperlim_sigma = self.parameters['em_syserr']
                     gausslogsf = scipy.stats.norm.logsf(
-                        data_mag[infIdx], mag_est[infIdx], upperlim_sigma
+                        data_mag[infMask], mag_est[infMask], upperlim_sigma
                     )
                 else:
                     gausslogsf = scipy.stats.norm.logsf(
-                        data_mag[infIdx], mag_est[infIdx], self.error_budget[filt]
+                        data_mag[infMask], mag_est[infMask], self.error_budget[filt]
                     )
                 gaussprob_total += np.sum(gausslogsf)
 
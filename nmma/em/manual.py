@@ -618,8 +618,7 @@ def main(args=None):
                 ax2 = plt.subplot(len(filters_plot), 1, cnt, sharex=ax1, sharey=ax1)
 
             samples = data[filt]
-            t, y, sigma_y = samples[:, 0], samples[:, 1], samples[:, 2]
-            t -= trigger_time
+            t, y, sigma_y = samples[:, 0] - trigger_time, samples[:, 1], samples[:, 2]
             idx = np.where(~np.isnan(y))[0]
             t, y, sigma_y = t[idx], y[idx], sigma_y[idx]
 
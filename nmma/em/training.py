@@ -2,7 +2,6 @@ import json
 import os
 import joblib
 import warnings
-import matplotlib.pyplot as plt
 import numpy as np
 from scipy.interpolate import interpolate as interp
 from scipy.interpolate import UnivariateSpline
@@ -468,6 +467,8 @@ class SVDTrainingModel(object):
             )
 
             if self.plot:
+                import matplotlib.pyplot as plt
+
                 loss = training_history.history["loss"]
                 val_loss = training_history.history["val_loss"]
                 plt.figure()
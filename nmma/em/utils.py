@@ -1,5 +1,3 @@
-import copy
-
 import json
 import numpy as np
 import os
@@ -17,8 +15,6 @@ from astropy.cosmology import Planck18, z_at_value
 import astropy.units
 import astropy.constants
 
-import matplotlib
-import matplotlib.pyplot as plt
 from nmma.em.training import SVDTrainingModel
 
 try:
@@ -234,20 +230,21 @@ def getFilteredMag(mag, filt):
 
 
 def dataProcess(raw_data, filters, triggerTime, tmin, tmax):
-    processedData = copy.deepcopy(raw_data)
+    # the arrays of the filters processed below are rebuilt rather than
+    # modified in place, so a shallow copy is enough to leave raw_data intact
+    processedData = dict(raw_data)
     for filt in filters:
         if filt not in processedData:
             continue
-        time = processedData[filt][:, 0]
         mag = processedData[filt][:, 1]
         dmag = processedData[filt][:, 2]
         # shift the time by the triggerTime
-        time -= triggerTime
+        time = processedData[filt][:, 0] - triggerTime
 
         # filter the out of range data
-        idx = np.where((time > tmin) * (time < tmax))[0]
+        mask = (time > tmin) & (time < tmax)
 
-        data = np.vstack((time[idx], mag[idx], dmag[idx])).T
+        data = np.vstack((time[mask], mag[mask], dmag[mask])).T
         processedData[filt] = data
 
     return processedData
@@ -1397,6 +1394,9 @@ class Spectrum(object):
             contains figure information
         """
 
+        import matplotlib
+        import matplotlib.pyplot as plt
+
         if ax is None:
             fig, ax = plt.subplots()
 
@@ -1,5 +1,7 @@
 from argparse import Namespace
 import os
+
+import bilby
 import pytest
 
 
@@ -112,3 +114,19 @@ def test_analysis_slurm(args):
     args.__dict__.update(args_slurm.__dict__)
 
     analysis_slurm.main(args)
+
+
+def test_analysis_nautilus_not_implemented(args, monkeypatch, tmp_path):
+
+    # nautilus-sampler does not register a bilby sampler plugin
+    monkeypatch.delitem(
+        bilby.core.sampler.IMPLEMENTED_SAMPLERS._samplers, "nautilus", raising=False
+    )
+    args_nautilus = Namespace(**vars(args))
+    args_nautilus.sampler = "nautilus"
+    args_nautilus.outdir = str(tmp_path / "outdir")
+
+    with pytest.raises(SystemExit):
+        analysis.main(args_nautilus)
+    # it fails before any of the logger, data or model setup
+    assert not os.path.exists(args_nautilus.outdir)